@@ -1,8 +1,10 @@
 """Enricher Agent - Adds context and intelligence to extracted tasks"""
 
+import asyncio
 from typing import Dict, Any
 from utils.logger import app_logger
-from tools.gemini_tools import gemini_service
+from utils.llm_cache import enricher_cache, text_key
+from tools.gemini_tools import get_gemini_service
 from utils.memory import SessionMemory
 
 class EnricherAgent:
@@ -11,27 +13,56 @@ class EnricherAgent:
     def __init__(self, memory: SessionMemory):
         self.memory = memory
     
-    async def enrich_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+    async def prefetch_context(self) -> str:
+        """Assemble the memory context used by enrichment
+
+        Independent of the parsed task, so the orchestrator can run this
+        concurrently with the parser's LLM call and hand the result to
+        enrich_task once the task structure is available.
+        """
+        context, patterns = self.memory.get_context_and_patterns(limit=5)
+        return f"{context}\nUser patterns: {patterns}"
+
+    async def enrich_task(self, task: Dict[str, Any], context_str: str = None) -> Dict[str, Any]:
         """
         Enhance task using context and patterns
         - Infer priority from keywords
         - Suggest labels
         - Learn from user patterns
         """
-        app_logger.info(f"Enriching task: {task['title']}")
-        
-        # Get context from memory
-        context = self.memory.get_context(limit=5)
-        patterns = self.memory.get_user_patterns()
-        
-        context_str = f"{context}\nUser patterns: {patterns}"
-        
-        # Use LLM to enhance
-        enriched_task = gemini_service.enrich_task(task, context_str)
-        
-        app_logger.info(f"Enriched task priority: {enriched_task.get('priority')}")
+        app_logger.info("Enriching task: %s", task["title"])
+
+        if context_str is None:
+            context_str = await self.prefetch_context()
+
+        # Same task under the same context enriches identically - skip the call
+        key = text_key(str(task.get("title", "")), str(task.get("description", "")), context_str)
+        cached = enricher_cache.get(key)
+        if cached is not None:
+            app_logger.info("Enricher cache hit")
+            return dict(cached)
+
+        # Use LLM to enhance (async call - doesn't block the event loop)
+        enriched_task = await get_gemini_service().aenrich_task(task, context_str)
+
+        enricher_cache.put(key, dict(enriched_task))
+
+        app_logger.info("Enriched task priority: %s", enriched_task.get("priority"))
         return enriched_task
 
+    async def enrich_tasks(self, tasks: list) -> list:
+        """Enrich many tasks in a single batched LLM call"""
+        app_logger.info("Batch enriching %d tasks", len(tasks))
+
+        context_str = await self.prefetch_context()
+
+        # enrich_task_batch is a synchronous HTTP round-trip; run it in a
+        # worker thread so the event loop (drain worker, concurrent
+        # process_input calls) keeps making progress
+        return await asyncio.to_thread(
+            get_gemini_service().enrich_task_batch, tasks, context_str
+        )
+
 class EnricherAgentFactory:
     @staticmethod
     def create(memory: SessionMemory) -> EnricherAgent:
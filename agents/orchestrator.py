@@ -1,28 +1,67 @@
 """Root Orchestrator - Coordinates all agents (Framework-Agnostic)"""
 
+import asyncio
+import contextlib
 import os
 from typing import Dict, Any, Optional
 from utils.logger import app_logger
 from utils.memory import SessionMemory
 from utils.tracing import setup_tracing, get_tracer
-from .input_processor import input_processor_agent
-from .parser_agent import parser_agent
-from .enricher_agent import EnricherAgentFactory
-from .vikunja_agent import VikunjaBAgentFactory
 
 class TaskFlowOrchestrator:
-    """Main orchestration agent - Framework agnostic (No ADK dependency)"""
-    
+    """Main orchestration agent - Framework agnostic (No ADK dependency)
+
+    Sub-agents are imported lazily on first use so that starting up (and
+    runs that only exercise one channel) don't pay the import cost of the
+    whole tool chain (gemini/voice/email/vikunja).
+    """
+
     def __init__(self):
         self.memory = SessionMemory(
             ttl_seconds=int(os.getenv("SESSION_TTL_SECONDS", "3600")),
             max_items=int(os.getenv("MAX_MEMORY_ITEMS", "100"))
         )
-        self.enricher_agent = EnricherAgentFactory.create(self.memory)
-        self.vikunja_agent = VikunjaBAgentFactory.create(self.memory)
+        self._enricher_agent = None
+        self._vikunja_agent = None
+        self._input_processor = None
+        self._parser = None
         self.tracer = setup_tracing("taskflow-ai")
         self._initialized = False
-    
+        # Vikunja writes are decoupled from the LLM stages: enriched tasks
+        # are queued and drained by a background worker in chunks, so the
+        # next input's Gemini calls overlap in-flight REST requests
+        self._vikunja_queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._drain_chunk = int(os.getenv("VIKUNJA_DRAIN_CHUNK", "8"))
+
+    @property
+    def enricher_agent(self):
+        if self._enricher_agent is None:
+            from .enricher_agent import EnricherAgentFactory
+            self._enricher_agent = EnricherAgentFactory.create(self.memory)
+        return self._enricher_agent
+
+    @property
+    def vikunja_agent(self):
+        if self._vikunja_agent is None:
+            from .vikunja_agent import VikunjaBAgentFactory
+            self._vikunja_agent = VikunjaBAgentFactory.create(self.memory)
+        return self._vikunja_agent
+
+    @property
+    def input_processor(self):
+        if self._input_processor is None:
+            from .input_processor import input_processor_agent
+            self._input_processor = input_processor_agent
+        return self._input_processor
+
+    @property
+    def parser(self):
+        if self._parser is None:
+            from .parser_agent import parser_agent
+            self._parser = parser_agent
+        return self._parser
+
     async def initialize(self) -> bool:
         """Initialize orchestrator and all sub-components"""
         try:
@@ -36,69 +75,184 @@ class TaskFlowOrchestrator:
             gemini_key = os.getenv("GEMINI_API_KEY")
             if not gemini_key:
                 raise ValueError("GEMINI_API_KEY not set")
-            
+
+            # Start the Vikunja drain worker
+            if self._vikunja_queue is None:
+                self._vikunja_queue = asyncio.Queue()
+                self._drain_task = asyncio.create_task(self._drain_vikunja_queue())
+
             self._initialized = True
             app_logger.info("TaskFlow Orchestrator initialized successfully")
             return True
         
         except Exception as e:
-            app_logger.error(f"Initialization error: {e}")
+            app_logger.error("Initialization error: %s", e)
             raise
     
-    async def process_input(self, input_data: Any, input_type: str = "text") -> Dict[str, Any]:
+    def _span(self, name: str):
+        """Child span context manager, or a no-op when tracing is disabled"""
+        if self.tracer:
+            return self.tracer.start_as_current_span(name)
+        return contextlib.nullcontext()
+
+    async def _drain_vikunja_queue(self) -> None:
+        """Background worker: create queued tasks in Vikunja in chunks"""
+        while True:
+            item = await self._vikunja_queue.get()
+            batch = [item]
+            while len(batch) < self._drain_chunk:
+                try:
+                    batch.append(self._vikunja_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            async def create_one(enriched_task, source_type, future):
+                try:
+                    created = await self.vikunja_agent.create_task(
+                        enriched_task, source_type=source_type
+                    )
+                    if not future.done():
+                        future.set_result(created)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+
+            await asyncio.gather(*(create_one(*entry) for entry in batch))
+            for _ in batch:
+                self._vikunja_queue.task_done()
+
+    async def process_input(self, input_data: Any, input_type: str = "text",
+                            wait_for_creation: bool = True) -> Dict[str, Any]:
         """Main processing pipeline"""
         
         if not self._initialized:
             await self.initialize()
-        
-        trace_span = self.tracer.start_as_current_span("process_input") if self.tracer else None
-        
+
+        # start_as_current_span returns a context manager; entering it is what
+        # activates the span (the old start/end-by-hand pattern leaked the
+        # current-span activation)
+        with self._span("process_input"):
+            try:
+                app_logger.info("Processing %s input", input_type)
+
+                # Step 1: Input Processing. Short explicit text that can't
+                # contain any email/voice marker (all of which need ':', '['
+                # or '.') skips the detect/normalize machinery entirely.
+                if (input_type == "text" and isinstance(input_data, str)
+                        and len(input_data) < 512
+                        and ":" not in input_data
+                        and "[" not in input_data
+                        and "." not in input_data):
+                    normalized_text, detected_type = input_data.strip(), "text"
+                else:
+                    with self._span("input_processing"):
+                        normalized_text, detected_type = await self.input_processor.detect_and_process(
+                            input_data, input_type
+                        )
+
+                self.memory.add_interaction(input_type, normalized_text, detected_type)
+
+                # Steps 2+3a: Task Extraction in parallel with enrichment-context
+                # prefetch (the enrichment prompt itself needs the parsed task,
+                # but its memory context doesn't)
+                with self._span("parser"):
+                    task, context_str = await asyncio.gather(
+                        self.parser.extract_task_structure(normalized_text),
+                        self.enricher_agent.prefetch_context()
+                    )
+
+                # Step 3b: Task Enrichment
+                with self._span("enricher"):
+                    enriched_task = await self.enricher_agent.enrich_task(task, context_str)
+
+                # Step 4: Task Creation in Vikunja (queued; the drain worker
+                # issues the REST call so new inputs can start immediately)
+                with self._span("vikunja_create"):
+                    creation = asyncio.get_running_loop().create_future()
+                    await self._vikunja_queue.put((enriched_task, detected_type, creation))
+
+                    created_task = await creation if wait_for_creation else None
+
+                result = {
+                    "success": True,
+                    "task_id": created_task.get("id") if created_task else -1,
+                    "title": enriched_task.get("title"),
+                    "source": detected_type,
+                    "priority": enriched_task.get("priority"),
+                    "labels": enriched_task.get("labels", [])
+                }
+
+                app_logger.info("Processing complete: %s", result)
+                return result
+
+            except Exception as e:
+                app_logger.error("Processing error: %s", e)
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "source": input_type
+                }
+    
+    async def process_batch(self, inputs: list, input_type: str = "text") -> list:
+        """Process many inputs with batched Gemini calls
+
+        Normalizes all inputs, then issues ONE parser call and ONE enricher
+        call for the whole batch instead of two Gemini round-trips per input.
+        Vikunja creations still run per-task (concurrently).
+        """
+
+        if not self._initialized:
+            await self.initialize()
+
+        if not inputs:
+            return []
+
+        app_logger.info("Batch processing %d %s inputs", len(inputs), input_type)
+
         try:
-            app_logger.info(f"Processing {input_type} input")
-            
-            # Step 1: Input Processing
-            normalized_text, detected_type = await input_processor_agent.detect_and_process(
-                input_data, input_type
-            )
-            
-            self.memory.add_interaction(input_type, normalized_text, detected_type)
-            
-            # Step 2: Task Extraction
-            task = await parser_agent.extract_task_structure(normalized_text)
-            
-            # Step 3: Task Enrichment
-            enriched_task = await self.enricher_agent.enrich_task(task)
-            
-            # Step 4: Task Creation in Vikunja
-            created_task = await self.vikunja_agent.create_task(
-                enriched_task,
-                source_type=detected_type  # Use detected_type, not input_type!
-            )
-            
-            result = {
-                "success": True,
-                "task_id": created_task.get("id") if created_task else -1,
-                "title": enriched_task.get("title"),
-                "source": detected_type,
-                "priority": enriched_task.get("priority"),
-                "labels": enriched_task.get("labels", [])
-            }
-            
-            app_logger.info(f"Processing complete: {result}")
-            return result
-        
+            # Step 1: Input Processing (all items)
+            normalized = []
+            for input_data in inputs:
+                normalized_text, detected_type = await self.input_processor.detect_and_process(
+                    input_data, input_type
+                )
+                self.memory.add_interaction(input_type, normalized_text, detected_type)
+                normalized.append((normalized_text, detected_type))
+
+            # Step 2: Batched Task Extraction (one Gemini call)
+            tasks = await self.parser.extract_task_structures([t for t, _ in normalized])
+
+            # Step 3: Batched Task Enrichment (one Gemini call)
+            enriched_tasks = await self.enricher_agent.enrich_tasks(tasks)
+
+            # Step 4: Task Creation in Vikunja (concurrent per-task)
+            async def create_one(enriched_task, detected_type):
+                try:
+                    created = await self.vikunja_agent.create_task(
+                        enriched_task, source_type=detected_type
+                    )
+                    return {
+                        "success": True,
+                        "task_id": created.get("id") if created else -1,
+                        "title": enriched_task.get("title"),
+                        "source": detected_type,
+                        "priority": enriched_task.get("priority"),
+                        "labels": enriched_task.get("labels", [])
+                    }
+                except Exception as e:
+                    return {"success": False, "error": str(e), "source": detected_type}
+
+            results = list(await asyncio.gather(
+                *(create_one(task, dtype) for task, (_, dtype) in zip(enriched_tasks, normalized))
+            ))
+
+            app_logger.info("Batch processing complete: %d/%d succeeded", sum(1 for r in results if r.get("success")), len(results))
+            return results
+
         except Exception as e:
-            app_logger.error(f"Processing error: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "source": input_type
-            }
-        
-        finally:
-            if trace_span:
-                trace_span.end()
-    
+            app_logger.error("Batch processing error: %s", e)
+            return [{"success": False, "error": str(e), "source": input_type} for _ in inputs]
+
     def get_memory_context(self) -> Dict[str, Any]:
         """Get session memory state"""
         return self.memory.to_dict()
@@ -106,3 +260,9 @@ class TaskFlowOrchestrator:
     async def cleanup(self) -> None:
         """Cleanup resources"""
         app_logger.info("Cleaning up TaskFlow Orchestrator")
+        if self._drain_task is not None:
+            await self._vikunja_queue.join()
+            self._drain_task.cancel()
+            self._drain_task = None
+        if self._vikunja_agent is not None:
+            await self._vikunja_agent.cleanup()
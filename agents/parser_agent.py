@@ -1,8 +1,24 @@
 """Parser Agent - Extracts structured task from natural language using LLM"""
 
+import logging
 from typing import Dict, Any
 from utils.logger import app_logger
-from tools.gemini_tools import gemini_service
+from utils.llm_cache import parser_cache, text_key
+from tools.gemini_tools import get_gemini_service
+
+# Default shape for extracted tasks; one C-level dict merge against this
+# template replaces five setdefault lookups per task
+_TASK_DEFAULTS = {"title": None, "description": None, "priority": 1,
+                  "due_date": None, "labels": ()}
+
+def _apply_defaults(task: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Fill missing/empty task fields from the source text"""
+    task = {**_TASK_DEFAULTS, **task}
+    task["title"] = task["title"] or text[:50]
+    task["description"] = task["description"] or text
+    if task["labels"] is _TASK_DEFAULTS["labels"]:
+        task["labels"] = []
+    return task
 
 class ParserAgent:
     """Extracts structured task data from unstructured text"""
@@ -12,18 +28,37 @@ class ParserAgent:
         Use LLM to extract task structure
         Returns: {title, description, priority, due_date, labels}
         """
-        app_logger.info(f"Extracting structure from: {text[:80]}...")
-        
-        task = gemini_service.extract_task_structure(text)
-        
+        if app_logger.isEnabledFor(logging.INFO):
+            app_logger.info("Extracting structure from: %s...", text[:80])
+
+        # Duplicate inputs skip the Gemini round-trip entirely
+        key = text_key(text)
+        cached = parser_cache.get(key)
+        if cached is not None:
+            app_logger.info("Parser cache hit")
+            return dict(cached)
+
+        # Async Gemini call: the round-trip awaits on the loop instead of
+        # blocking it, so sibling work (context prefetch, other inputs)
+        # overlaps with the LLM latency
+        task = await get_gemini_service().aextract_task_structure(text)
+
         # Ensure required fields
-        task.setdefault("title", text[:50])
-        task.setdefault("description", text)
-        task.setdefault("priority", 1)
-        task.setdefault("due_date", None)
-        task.setdefault("labels", [])
-        
-        app_logger.info(f"Extracted task: {task['title']}")
+        task = _apply_defaults(task, text)
+
+        parser_cache.put(key, dict(task))
+
+        app_logger.info("Extracted task: %s", task["title"])
         return task
 
+    async def extract_task_structures(self, texts: list) -> list:
+        """Extract structures for many texts in a single batched LLM call"""
+        app_logger.info("Batch extracting structure for %d inputs", len(texts))
+
+        # Large ingests go through the async Batch API (half price, higher
+        # throughput); small ones stay on the single packed-prompt call
+        tasks = await get_gemini_service().batch_extract_task_structure(texts)
+
+        return [_apply_defaults(task, text) for text, task in zip(texts, tasks)]
+
 parser_agent = ParserAgent()
@@ -1,5 +1,8 @@
 """Vikunja Agent - Creates tasks in Vikunja via REST API"""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, Any, Optional
 from utils.logger import app_logger
 from tools.vikunja_api import create_vikunja_client
@@ -8,10 +11,16 @@ import asyncio
 
 class VikunjaBAgent:
     """Handles task creation in Vikunja"""
-    
+
     def __init__(self, memory: SessionMemory):
         self.memory = memory
         self.vikunja_client = create_vikunja_client()
+        # Dedicated bounded pool so concurrent task creations don't thrash
+        # the default executor's unbounded thread spawning
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("VIKUNJA_POOL", "8")),
+            thread_name_prefix="vikunja"
+        )
         self._initialized = False
     
     async def initialize(self) -> bool:
@@ -33,30 +42,38 @@ class VikunjaBAgent:
             return True
         
         except Exception as e:
-            app_logger.error(f"Vikunja init error: {e}")
+            app_logger.error("Vikunja init error: %s", e)
             return False
     
     async def create_task(self, task: Dict[str, Any], source_type: str = "text") -> Dict[str, Any]:
         """Create task in Vikunja"""
         try:
-            app_logger.info(f"Creating task in Vikunja: {task.get('title')} from source '{source_type}'")
+            app_logger.info("Creating task in Vikunja: %s from source '%s'", task.get("title"), source_type)
             
             # Pass source_type for color coding
-            result = await asyncio.to_thread(
-                self.vikunja_client.create_task,
-                title=task.get("title", ""),
-                description=task.get("description", ""),
-                priority=task.get("priority", 1),
-                due_date=task.get("due_date"),
-                labels=task.get("labels", []),
-                source_type=source_type
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor,
+                partial(
+                    self.vikunja_client.create_task,
+                    title=task.get("title", ""),
+                    description=task.get("description", ""),
+                    priority=task.get("priority", 1),
+                    due_date=task.get("due_date"),
+                    labels=task.get("labels", []),
+                    source_type=source_type
+                )
             )
-            
+
             return result
         except Exception as e:
-            app_logger.error(f"Error creating task in Vikunja: {e}")
+            app_logger.error("Error creating task in Vikunja: %s", e)
             raise
 
+    async def cleanup(self) -> None:
+        """Release the worker pool"""
+        self._executor.shutdown(wait=False)
+
 class VikunjaBAgentFactory:
     @staticmethod
     def create(memory: SessionMemory) -> VikunjaBAgent:
@@ -6,6 +6,7 @@ Shows all input channels and features
 
 import asyncio
 import json
+import os
 from pathlib import Path
 from agents.orchestrator import TaskFlowOrchestrator
 from utils.logger import app_logger
@@ -39,9 +40,14 @@ Priority: BLOCKER""",
     ]
 }
 
-async def demo_single_input(orchestrator: TaskFlowOrchestrator, input_type: str, input_data: str) -> dict:
+async def demo_single_input(orchestrator: TaskFlowOrchestrator, input_type: str, input_data: str,
+                            sem: asyncio.Semaphore = None) -> dict:
     """Process a single input through the pipeline"""
-    
+
+    if sem:
+        async with sem:
+            return await demo_single_input(orchestrator, input_type, input_data)
+
     print(f"\\n{'='*70}")
     print(f"📥 Input Type: {input_type.upper()}")
     print(f"{'='*70}")
@@ -77,30 +83,36 @@ async def demo_all_channels(orchestrator: TaskFlowOrchestrator) -> dict:
         "voice": [],
         "summary": {}
     }
-    
-    # Test text inputs
+
+    # Bound concurrent Gemini/Vikunja calls
+    sem = asyncio.Semaphore(int(os.getenv("DEMO_CONCURRENCY", "8")))
+
+    # Test text inputs (one batched Gemini call for the whole channel)
     print("\\n" + "🔤 " + "="*68)
     print("🔤 TESTING TEXT INPUTS")
     print("🔤 " + "="*68)
-    for text_input in SAMPLE_INPUTS["text"]:
-        result = await demo_single_input(orchestrator, "text", text_input)
-        results["text"].append(result)
-    
+    results["text"] = await orchestrator.process_batch(SAMPLE_INPUTS["text"], input_type="text")
+    for result in results["text"]:
+        if result.get("success"):
+            print(f"✅ SUCCESS: {result.get('title')} (Task ID: {result.get('task_id')})")
+        else:
+            print(f"❌ FAILED: {result.get('error')}")
+
     # Test email inputs
     print("\\n" + "📧 " + "="*68)
     print("📧 TESTING EMAIL INPUTS")
     print("📧 " + "="*68)
-    for email_input in SAMPLE_INPUTS["email"]:
-        result = await demo_single_input(orchestrator, "email", email_input)
-        results["email"].append(result)
-    
+    results["email"] = list(await asyncio.gather(
+        *(demo_single_input(orchestrator, "email", e, sem) for e in SAMPLE_INPUTS["email"])
+    ))
+
     # Test voice inputs (mock mode by default)
     print("\\n" + "🎤 " + "="*68)
     print("🎤 TESTING VOICE INPUTS (Mock Mode)")
     print("🎤 " + "="*68)
-    for voice_input in SAMPLE_INPUTS["voice"]:
-        result = await demo_single_input(orchestrator, "voice", voice_input)
-        results["voice"].append(result)
+    results["voice"] = list(await asyncio.gather(
+        *(demo_single_input(orchestrator, "voice", v, sem) for v in SAMPLE_INPUTS["voice"])
+    ))
     
     # Generate summary
     total_success = sum(1 for r in results["text"] + results["email"] + results["voice"] 
@@ -220,5 +232,12 @@ async def main():
 
 if __name__ == "__main__":
     import sys
+
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # fall back to the default asyncio event loop
+
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
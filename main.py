@@ -57,21 +57,29 @@ It's needed for the board meeting."""
             }
         ]
     
-        for i, input_item in enumerate(sample_inputs, 1):
+        # Process all inputs concurrently, bounded to avoid flooding Gemini/Vikunja
+        sem = asyncio.Semaphore(int(os.getenv("DEMO_CONCURRENCY", "8")))
+
+        async def process_one(i: int, input_item: dict):
             try:
                 input_type = input_item.get("type", "text")
                 content = input_item.get("content", input_item)
-                
-                app_logger.info(f"\n>>> Processing Input {i} (type: {input_type})...")
-                result = await orchestrator.process_input(content, input_type)
-                
+
+                async with sem:
+                    app_logger.info(f"\n>>> Processing Input {i} (type: {input_type})...")
+                    result = await orchestrator.process_input(content, input_type)
+
                 if result.get("success"):
                     app_logger.info(f"✅ Success: {result.get('title')} [Source: {result.get('source')}]")
                 else:
                     app_logger.error(f"❌ Failed: {result.get('error')}")
-                    
+
             except Exception as e:
                 app_logger.error(f"❌ Error processing input {i}: {e}")
+
+        await asyncio.gather(
+            *(process_one(i, item) for i, item in enumerate(sample_inputs, 1))
+        )
         
         # Print memory summary
         app_logger.info("\\n" + "=" * 60)
@@ -99,5 +107,11 @@ It's needed for the board meeting."""
         return 1
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # fall back to the default asyncio event loop
+
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
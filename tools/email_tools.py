@@ -2,36 +2,53 @@ from typing import Dict, Any
 import re
 from utils.logger import app_logger
 
+# Common email signature markers, fused into one compiled alternation so
+# stripping them is a single pass over the body instead of three re.sub calls
+_SIG_RE = re.compile(r"^\s*(?:--.*|Best,.*|Thanks,.*)$", re.MULTILINE)
+
+# Header prefixes keyed by their first character: one dict lookup picks the
+# only candidate prefix for a line, replacing a cascade of startswith checks
+_HDR_DISPATCH = {
+    "F": ("From:", "from"),
+    "T": ("To:", "to"),
+    "S": ("Subject:", "subject"),
+}
+
 class EmailProcessor:
     """Parse email content"""
-    
+
     @staticmethod
     def parse_email(email_text: str) -> Dict[str, str]:
         """Extract email components"""
-        
+
         result = {
             "from": "",
             "to": "",
             "subject": "",
             "body": ""
         }
-        
-        lines = email_text.split("\n")
-        body_start = 0
-        
-        for i, line in enumerate(lines):
-            if line.startswith("From:"):
-                result["from"] = line.replace("From:", "").strip()
-            elif line.startswith("To:"):
-                result["to"] = line.replace("To:", "").strip()
-            elif line.startswith("Subject:"):
-                result["subject"] = line.replace("Subject:", "").strip()
-            elif line.strip() == "":
-                body_start = i + 1
-                break
-        
-        result["body"] = "\n".join(lines[body_start:]).strip()
-        
+
+        # Split header block from body at the first blank line (LF or CRLF
+        # conventions); the body is kept as a single slice so we never
+        # re-join it line by line. With no separator (e.g. plain text
+        # misdetected as email) the whole text doubles as both, so the
+        # content is never dropped.
+        lf_end = email_text.find("\n\n")
+        crlf_end = email_text.find("\r\n\r\n")
+        if crlf_end != -1 and (lf_end == -1 or crlf_end < lf_end):
+            header_blob, body = email_text[:crlf_end], email_text[crlf_end + 4:]
+        elif lf_end != -1:
+            header_blob, body = email_text[:lf_end], email_text[lf_end + 2:]
+        else:
+            header_blob, body = email_text, email_text
+
+        for line in header_blob.split("\n"):
+            entry = _HDR_DISPATCH.get(line[:1])
+            if entry and line.startswith(entry[0]):
+                result[entry[1]] = line[len(entry[0]):].strip()
+
+        result["body"] = body.strip()
+
         return result
     
     @staticmethod
@@ -41,11 +58,9 @@ class EmailProcessor:
         # Combine subject + body
         text = f"{email_data['subject']}. {email_data['body']}"
         
-        # Remove common email signatures
-        text = re.sub(r"^\s*--.*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\s*Best,.*", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\s*Thanks,.*", "", text, flags=re.MULTILINE)
-        
+        # Remove common email signatures (single fused pass)
+        text = _SIG_RE.sub("", text)
+
         return text.strip()
 
 email_processor = EmailProcessor()
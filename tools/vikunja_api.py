@@ -1,9 +1,35 @@
-import requests
-from typing import Dict, Any, Optional
+import base64
+import json
+import os
+import time
+import httpx
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import ijson  # incremental JSON parsing for large task lists
+except ImportError:
+    ijson = None
 from datetime import datetime
 from utils.logger import app_logger
 from config import settings
 
+# Connect/read timeouts applied to every call so hung sockets can't pin
+# pool slots indefinitely
+_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# Minimum remaining token lifetime before we bother re-logging in
+_TOKEN_SLACK_SECONDS = 60
+
+def _jwt_exp(token: str) -> float:
+    """Extract the exp claim from a JWT, or 0 if it can't be parsed"""
+    try:
+        payload = token.split(".")[1]
+        decoded = base64.urlsafe_b64decode(payload + "==")
+        return float(json.loads(decoded).get("exp", 0))
+    except Exception:
+        return 0.0
+
 # Color coding by input source
 COLOR_MAPPING = {
     "voice": "#03346E",      # Dark Blue (voice input)
@@ -12,6 +38,31 @@ COLOR_MAPPING = {
     "default": "#000000"     # Black (fallback)
 }
 
+class _ByteStreamReader:
+    """Minimal file-like view over an httpx byte-chunk iterator
+
+    ijson needs a source with .read(); httpx stream responses only
+    expose chunk iterators, so this buffers just enough to honor each
+    read size without materializing the body.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buf = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            out = self._buf + b"".join(self._chunks)
+            self._buf = b""
+            return out
+        while len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
 class VikunjaBClient:
     """Vikunja REST API client - Fixed version"""
     
@@ -22,18 +73,72 @@ class VikunjaBClient:
         self.project_id = project_id or settings.VIKUNJA_PROJECT_ID
         self.token: Optional[str] = None
         self.headers = {"Content-Type": "application/json"}
-    
+
+        # Persistent HTTP/2 client: concurrent requests multiplex as
+        # streams over one shared TLS connection instead of negotiating
+        # a TCP+TLS handshake per worker
+        self.client = httpx.Client(
+            headers=self.headers,
+            timeout=_TIMEOUT,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=20,
+                                    max_connections=100),
+            ),
+        )
+
+        # Reuse a still-valid token from a previous process so fresh runs
+        # skip the login round-trip
+        self._token_cache = Path(os.path.expanduser("~")) / ".cache" / "taskflow" / "vikunja.json"
+        self._load_cached_token()
+
+    def _load_cached_token(self) -> None:
+        """Adopt the on-disk token if it has usable lifetime left"""
+        try:
+            data = json.loads(self._token_cache.read_text())
+            if data.get("exp", 0) - time.time() > _TOKEN_SLACK_SECONDS:
+                self.token = data["token"]
+                self.client.headers["Authorization"] = f"Bearer {self.token}"
+                app_logger.info("Reusing cached Vikunja token")
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _store_token(self) -> None:
+        """Persist the current token with its expiry (owner-only perms)"""
+        try:
+            self._token_cache.parent.mkdir(parents=True, exist_ok=True)
+            self._token_cache.write_text(
+                json.dumps({"token": self.token, "exp": _jwt_exp(self.token)})
+            )
+            os.chmod(self._token_cache, 0o600)
+        except OSError as e:
+            app_logger.warning(f"Could not cache Vikunja token: {e}")
+
+    def _clear_cached_token(self) -> None:
+        """Drop the in-memory and on-disk token (e.g. after a 401)"""
+        self.token = None
+        try:
+            del self.client.headers["Authorization"]
+        except KeyError:
+            pass
+        try:
+            self._token_cache.unlink()
+        except OSError:
+            pass
+
     def authenticate(self) -> bool:
         """Login to Vikunja"""
         try:
             url = f"{self.base_url}/api/v1/login"
             payload = {"username": self.username, "password": self.password}
-            
-            response = requests.post(url, json=payload, headers=self.headers)
-            
+
+            response = self.client.post(url, json=payload)
+
             if response.status_code == 200:
                 self.token = response.json().get("token")
-                self.headers["Authorization"] = f"Bearer {self.token}"
+                self.client.headers["Authorization"] = f"Bearer {self.token}"
+                self._store_token()
                 app_logger.info("Vikunja authentication successful")
                 return True
             else:
@@ -55,16 +160,21 @@ class VikunjaBClient:
         # Map source type to color
         hex_color = COLOR_MAPPING.get(source_type.lower(), COLOR_MAPPING["default"])
         
-        # Format date properly
+        # Format date properly. The common case is a bare YYYY-MM-DD from
+        # the extractor - a shape check and concatenation covers it without
+        # datetime/timezone allocations; anything else goes through the
+        # full parse.
         if due_date:
-            try:
-                # Parse if it's a date string
-                dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                start_date = dt.strftime("%Y-%m-%dT00:00:00Z")
-            except:
-                start_date = due_date
+            if len(due_date) == 10 and due_date[4] == '-' and due_date[7] == '-':
+                start_date = due_date + "T00:00:00Z"
+            else:
+                try:
+                    dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+                    start_date = dt.strftime("%Y-%m-%dT00:00:00Z")
+                except:
+                    start_date = due_date
         else:
-            start_date = datetime.now().strftime("%Y-%m-%dT00:00:00Z")
+            start_date = datetime.utcnow().date().isoformat() + "T00:00:00Z"
         
         # Build payload - CRITICAL: Use PUT not POST!
         payload = {
@@ -81,12 +191,22 @@ class VikunjaBClient:
             payload["priority"] = priority
         
         try:
-            response = requests.put(
+            response = self.client.put(
                 f"{self.base_url}/api/v1/projects/{self.project_id}/tasks",
-                json=payload,
-                headers=self.headers
+                json=payload
             )
-            
+
+            # Cached token may have been revoked - refresh once and retry
+            if response.status_code == 401:
+                app_logger.warning("Vikunja token rejected, re-authenticating")
+                self._clear_cached_token()
+                if not self.authenticate():
+                    raise Exception("Not authenticated with Vikunja")
+                response = self.client.put(
+                    f"{self.base_url}/api/v1/projects/{self.project_id}/tasks",
+                    json=payload
+                )
+
             if response.status_code in [200, 201]:
                 task = response.json()
                 task_id = task.get("id")
@@ -102,33 +222,59 @@ class VikunjaBClient:
             app_logger.error(f"Error creating task: {e}")
             raise
     
-    def list_tasks(self) -> list:
-        """List all tasks in project"""
-        
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Stream tasks in the project one at a time
+
+        Parses the response body incrementally with ijson (Vikunja
+        returns a top-level array, so the prefix is 'item'), so a project
+        with thousands of tasks never materializes as one multi-MB list.
+        Callers that only need the most recent N can islice the iterator.
+        Falls back to the buffered parse when ijson is unavailable.
+        """
+
         if not self.token:
             if not self.authenticate():
-                return []
-        
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/v1/projects/{self.project_id}/tasks",
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                app_logger.error(f"Failed to list tasks: {response.status_code}")
-                return []
-        
-        except Exception as e:
-            app_logger.error(f"Error listing tasks: {e}")
-            return []
+                return
+
+        url = f"{self.base_url}/api/v1/projects/{self.project_id}/tasks"
+
+        for attempt in (0, 1):
+            try:
+                with self.client.stream("GET", url) as response:
+                    if response.status_code == 401 and attempt == 0:
+                        app_logger.warning("Vikunja token rejected, re-authenticating")
+                        self._clear_cached_token()
+                        if not self.authenticate():
+                            return
+                        continue
+
+                    if response.status_code != 200:
+                        app_logger.error(f"Failed to list tasks: {response.status_code}")
+                        return
+
+                    if ijson is not None:
+                        # iter_bytes() yields content-decoded chunks;
+                        # the reader adapts them to the file-like source
+                        # ijson expects
+                        reader = _ByteStreamReader(response.iter_bytes())
+                        yield from ijson.items(reader, "item")
+                    else:
+                        response.read()
+                        yield from response.json()
+                    return
+
+            except Exception as e:
+                app_logger.error(f"Error listing tasks: {e}")
+                return
+
+    def list_tasks(self) -> list:
+        """List all tasks in project"""
+        return list(self.iter_tasks())
     
     def test_connection(self) -> bool:
         """Test Vikunja connection"""
         try:
-            response = requests.get(
+            response = self.client.get(
                 f"{self.base_url}/health",
                 timeout=5
             )
@@ -0,0 +1,204 @@
+"""LLM response cache - avoids repeat Gemini round-trips for duplicate inputs"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the semantic tier
+    np = None
+
+class LRUCache:
+    """O(1) LRU cache backed by OrderedDict"""
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        """Return cached value and mark it most-recently-used, or None"""
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        """Insert value, evicting the least-recently-used entry if full"""
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = value
+        if len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SLRUCache:
+    """Segmented LRU - scan-resistant variant of LRUCache
+
+    New entries land in a probationary segment and are promoted to a
+    protected segment on their second hit. A burst of one-off keys can
+    only churn the probationary segment, so frequently reused entries
+    (e.g. the recurring task phrasings that define user patterns)
+    survive scans that would flush a plain LRU.
+    """
+
+    def __init__(self, capacity: int = 512, protected_ratio: float = 0.75):
+        self.protected_capacity = max(1, int(capacity * protected_ratio))
+        self.probation_capacity = max(1, capacity - self.protected_capacity)
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        """Return cached value, promoting probationary entries on second hit"""
+        value = self._protected.get(key)
+        if value is not None:
+            self._protected.move_to_end(key)
+            return value
+
+        value = self._probation.pop(key, None)
+        if value is None:
+            return None
+
+        # Second hit: promote; demote the protected LRU back to probation
+        self._protected[key] = value
+        if len(self._protected) > self.protected_capacity:
+            demoted_key, demoted_value = self._protected.popitem(last=False)
+            self._insert_probation(demoted_key, demoted_value)
+        return value
+
+    def put(self, key, value) -> None:
+        """Insert value; existing protected entries are updated in place"""
+        if key in self._protected:
+            self._protected[key] = value
+            self._protected.move_to_end(key)
+            return
+        self._insert_probation(key, value)
+
+    def _insert_probation(self, key, value) -> None:
+        if key in self._probation:
+            self._probation.move_to_end(key)
+        self._probation[key] = value
+        if len(self._probation) > self.probation_capacity:
+            self._probation.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+def text_key(*parts: str) -> bytes:
+    """Stable digest key for one or more text fragments"""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode("utf-8", "ignore"))
+        h.update(b"\x00")
+    return h.digest()
+
+class SemanticCache:
+    """Two-tier response cache: exact-match L1 + embedding-similarity L2
+
+    L1 is an in-process SLRU keyed by the normalized text digest, so exact
+    repeats never touch the network. L2 persists embeddings and responses
+    in sqlite; a lookup embeds the query once and runs a cosine similarity
+    against the stacked stored vectors, hitting when the best match clears
+    the threshold - near-duplicates like "fix login bug" vs "fix the login
+    bug" short-circuit before any generate call. The L2 tier disables
+    itself when numpy or an embed function is unavailable.
+    """
+
+    def __init__(self, embed: Optional[Callable] = None, path: Optional[str] = None,
+                 threshold: float = 0.92, ttl_seconds: int = 86400, capacity: int = 512):
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl_seconds
+        self._l1 = SLRUCache(capacity=capacity)
+        self._embed_cache = LRUCache(capacity=64)
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if np is not None and embed is not None:
+            if path is None:
+                path = os.path.join(os.path.expanduser("~"), ".cache", "taskflow",
+                                    "semantic_cache.db")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key_hash TEXT PRIMARY KEY, namespace TEXT, "
+                "embedding BLOB, response TEXT, ts REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, namespace: str, text: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response for text (exact or near-duplicate)"""
+        key = text_key(namespace, text.strip().lower())
+
+        hit = self._l1.get(key)
+        if hit is not None:
+            return dict(hit)
+
+        if self._conn is None:
+            return None
+
+        vec = self._embed_normalized(key, text)
+        if vec is None:
+            return None
+
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT embedding, response, ts FROM responses WHERE namespace = ?",
+            (namespace,)
+        ).fetchall()
+        fresh = [(blob, resp) for blob, resp, ts in rows if now - ts < self.ttl]
+        if not fresh:
+            return None
+
+        matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for blob, _ in fresh])
+        sims = matrix @ vec  # stored vectors are unit-normalized
+        best = int(sims.argmax())
+        if sims[best] > self.threshold:
+            response = json.loads(fresh[best][1])
+            self._l1.put(key, dict(response))
+            return response
+        return None
+
+    def put(self, namespace: str, text: str, response: Dict[str, Any]) -> None:
+        """Store a response under both tiers"""
+        key = text_key(namespace, text.strip().lower())
+        self._l1.put(key, dict(response))
+
+        if self._conn is None:
+            return
+        vec = self._embed_normalized(key, text)
+        if vec is None:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key.hex(), namespace, vec.tobytes(), json.dumps(response), time.time())
+        )
+        self._conn.commit()
+
+    def _embed_normalized(self, key: bytes, text: str):
+        """Embed text to a unit float32 vector (memoized per key)"""
+        vec = self._embed_cache.get(key)
+        if vec is not None:
+            return vec
+        try:
+            values = self.embed(text)
+            vec = np.asarray(values, dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            if norm == 0:
+                return None
+            vec /= norm
+        except Exception:
+            return None
+        self._embed_cache.put(key, vec)
+        return vec
+
+# Shared caches for the two Gemini-backed pipeline stages; segmented so a
+# burst from one channel can't evict high-frequency entries from another
+parser_cache = SLRUCache(capacity=512)
+enricher_cache = SLRUCache(capacity=512)
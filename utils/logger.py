@@ -1,15 +1,25 @@
 import logging
 import json
-from datetime import datetime
+import time
 from typing import Any, Dict
 import os
 
+try:
+    import orjson  # 3-10x faster than stdlib json for log records
+except ImportError:
+    orjson = None
+
+_ISO = "%Y-%m-%dT%H:%M:%S"
+
 class JSONFormatter(logging.Formatter):
     """Format logs as structured JSON"""
-    
+
     def format(self, record: logging.LogRecord) -> str:
+        # logging already stamped the record at creation; reuse that float
+        # instead of calling datetime.utcnow() again per record
+        ts = record.created
         log_obj: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": f"{time.strftime(_ISO, time.gmtime(ts))}.{int(ts % 1 * 1e6):06d}",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -17,15 +27,18 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno,
         }
-        
+
         # Add exception info if present
         if record.exc_info:
             log_obj["exception"] = self.formatException(record.exc_info)
-        
+
         # Add extra fields
-        if hasattr(record, "extra_data"):
-            log_obj.update(record.extra_data)
-        
+        extra = getattr(record, "extra_data", None)
+        if extra:
+            log_obj.update(extra)
+
+        if orjson is not None:
+            return orjson.dumps(log_obj, default=str).decode()
         return json.dumps(log_obj, default=str)
 
 def setup_logging(name: str, level: str = "INFO") -> logging.Logger:
@@ -1,9 +1,11 @@
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from collections import Counter, deque
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
+from itertools import islice
 import json
 
-@dataclass
+@dataclass(slots=True)
 class Interaction:
     """Represents a user interaction"""
     type: str  # "voice", "email", "text"
@@ -12,7 +14,7 @@ class Interaction:
     channel: str
     task_created: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class TaskMemory:
     """Represents a created task in memory"""
     task_id: int
@@ -22,14 +24,31 @@ class TaskMemory:
     priority: int
     labels: List[str]
 
+# Field names resolved once per type; asdict() re-walks the field list
+# and deep-copies every value on each call, which is wasted work for
+# these primitive-only records
+_INTERACTION_FIELDS = tuple(f.name for f in fields(Interaction))
+_TASK_FIELDS = tuple(f.name for f in fields(TaskMemory))
+
+def _quick_dict(obj, field_names: tuple) -> Dict[str, Any]:
+    """Shallow field dict for a slotted record"""
+    return {name: getattr(obj, name) for name in field_names}
+
 class SessionMemory:
     """In-memory session storage with TTL"""
     
     def __init__(self, ttl_seconds: int = 3600, max_items: int = 100):
-        self.interactions: List[Interaction] = []
-        self.created_tasks: List[TaskMemory] = []
+        # deque(maxlen=...) evicts the oldest entry in O(1) on append,
+        # instead of reallocating and copying the list on every insert
+        self.interactions: deque = deque(maxlen=max_items)
+        self.created_tasks: deque = deque(maxlen=max_items)
         self.ttl = ttl_seconds
         self.max_items = max_items
+        # Running aggregates kept in sync with created_tasks so pattern
+        # queries are O(1) instead of re-scanning the whole history
+        self._priority_sum = 0
+        self._label_counter: Counter = Counter()
+        self._source_counter: Counter = Counter()
     
     def add_interaction(self, type_: str, content: str, channel: str) -> None:
         """Add user interaction to memory"""
@@ -40,10 +59,6 @@ class SessionMemory:
             channel=channel
         )
         self.interactions.append(interaction)
-        
-        # Keep only recent items
-        if len(self.interactions) > self.max_items:
-            self.interactions = self.interactions[-self.max_items:]
     
     def add_task_created(self, task_id: int, title: str, source: str, 
                         priority: int, labels: List[str]) -> None:
@@ -56,45 +71,66 @@ class SessionMemory:
             priority=priority,
             labels=labels
         )
+
+        # The deque will evict its oldest entry on this append if full;
+        # remove that entry's contribution from the aggregates first
+        if self.created_tasks.maxlen and len(self.created_tasks) == self.created_tasks.maxlen:
+            evicted = self.created_tasks[0]
+            self._priority_sum -= evicted.priority
+            self._label_counter.subtract(evicted.labels)
+            self._source_counter[evicted.source] -= 1
+
+        self._priority_sum += priority
+        self._label_counter.update(labels)
+        self._source_counter[source] += 1
+
         self.created_tasks.append(task)
-        
-        if len(self.created_tasks) > self.max_items:
-            self.created_tasks = self.created_tasks[-self.max_items:]
     
     def get_context(self, limit: int = 5) -> str:
         """Get recent context for enrichment"""
-        recent_tasks = self.created_tasks[-limit:]
+        # deques don't slice; walk the last `limit` items without copying more
+        recent_tasks = list(islice(reversed(self.created_tasks), limit))[::-1]
         context = "Recent tasks created:\n"
         for task in recent_tasks:
             context += f"- {task.title} (Priority: {task.priority}, Labels: {', '.join(task.labels)})\n"
         return context
     
+    def get_context_and_patterns(self, limit: int = 5) -> tuple:
+        """Build recent-task context and user patterns in one traversal
+
+        Fuses get_context + get_user_patterns so enrichment walks the
+        task history once instead of twice per call.
+        """
+        context_lines = ["Recent tasks created:"]
+
+        if not self.created_tasks:
+            return context_lines[0] + "\n", {}
+
+        for task in reversed(list(islice(reversed(self.created_tasks), limit))):
+            context_lines.append(
+                f"- {task.title} (Priority: {task.priority}, Labels: {', '.join(task.labels)})"
+            )
+
+        return "\n".join(context_lines) + "\n", self.get_user_patterns()
+
     def get_user_patterns(self) -> Dict[str, Any]:
-        """Extract user patterns from history"""
+        """Extract user patterns from the running aggregates - O(1)"""
         if not self.created_tasks:
             return {}
-        
-        # Analyze patterns
-        avg_priority = sum(t.priority for t in self.created_tasks) / len(self.created_tasks)
-        all_labels = set()
-        for task in self.created_tasks:
-            all_labels.update(task.labels)
-        
-        sources = {}
-        for task in self.created_tasks:
-            sources[task.source] = sources.get(task.source, 0) + 1
-        
+
+        total = len(self.created_tasks)
         return {
-            "average_priority": avg_priority,
-            "common_labels": list(all_labels),
-            "preferred_source": max(sources, key=sources.get) if sources else None,
-            "total_tasks": len(self.created_tasks)
+            "average_priority": self._priority_sum / total,
+            # subtract() can leave zero-count labels behind for evicted tasks
+            "common_labels": [label for label, n in self._label_counter.items() if n > 0],
+            "preferred_source": self._source_counter.most_common(1)[0][0],
+            "total_tasks": total
         }
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dict"""
         return {
-            "interactions": [asdict(i) for i in self.interactions],
-            "created_tasks": [asdict(t) for t in self.created_tasks],
+            "interactions": [_quick_dict(i, _INTERACTION_FIELDS) for i in self.interactions],
+            "created_tasks": [_quick_dict(t, _TASK_FIELDS) for t in self.created_tasks],
             "patterns": self.get_user_patterns()
         }
@@ -1,8 +1,9 @@
+import atexit
 import os
 from typing import Optional
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.exporter.jaeger.thrift import JaegerExporter
 from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.instrumentation.urllib3 import URLLib3Instrumentor
@@ -26,8 +27,17 @@ def setup_tracing(service_name: str = "taskflow-ai") -> Optional[trace.Tracer]:
         )
         
         tracer_provider = TracerProvider()
-        tracer_provider.add_span_processor(SimpleSpanProcessor(jaeger_exporter))
+        # Batch export: span end() becomes an in-memory enqueue instead of a
+        # synchronous Thrift round-trip to the Jaeger agent
+        tracer_provider.add_span_processor(BatchSpanProcessor(
+            jaeger_exporter,
+            max_queue_size=2048,
+            schedule_delay_millis=5000,
+            max_export_batch_size=512,
+        ))
         trace.set_tracer_provider(tracer_provider)
+        # Flush whatever is still queued when the process exits
+        atexit.register(tracer_provider.shutdown)
         
         tracer = trace.get_tracer(__name__)
         